@@ -6,6 +6,15 @@ import numpy as np
 import random
 import plotly.graph_objects as go
 import math as Math
+import io
+import os
+from urllib.parse import urlparse
+import result_cache
+import universe_model
+import universe_stream
+import viability_index
+import viability_rules
+from viability_rules import HIGH, LOW, OK
 
 # Section 1:
 
@@ -19,10 +28,37 @@ st.write("By Brody Bennett - For Physical Science")
 st.sidebar.header("🔧 **Fundamental Constants**")
 st.sidebar.text("(Loosely Relative Values; 1 = Reality)")
 
-G = st.sidebar.slider("Gravitational Constant (G)", 0.1, 10.0, 1.0, step=0.1)
-alpha = st.sidebar.slider("Electromagnetic Force (α)", 0.01, 2.0, 1.0, step=0.01)
-strong_force = st.sidebar.slider("Strong Nuclear Force", 0.1, 10.0, 1.0, step=0.1)
-lambda_const = st.sidebar.slider("Cosmological Constant (Λ)", 0.0, 2.0, 1.0, step=0.01)
+# Classroom mode puts the sliders in a form, so a whole drag (or several sliders) costs a single rerun.
+# Sliders stay live by default; classroom deployments turn the form on with SPACE_SIM_CLASSROOM_MODE=1.
+coalesce_sliders = st.sidebar.toggle("Apply changes with a button (classroom mode)",
+                                     value=os.environ.get("SPACE_SIM_CLASSROOM_MODE", "0") == "1")
+
+# Every constant starts at 1.0 (reality); the values live in session state so they can be snapped from code
+for key in ["G", "alpha", "strong_force", "lambda_const"]:
+    st.session_state.setdefault(key, 1.0)
+
+# Slider ranges come from the viability index's lattice, so its answers always cover every reachable setting
+axes = {axis.name: axis for axis in viability_index.AXES}
+
+with st.sidebar.form("constants") if coalesce_sliders else st.sidebar.container():
+    G = st.slider("Gravitational Constant (G)", axes["G"].start, axes["G"].stop,
+                  step=axes["G"].step, key="G")
+    alpha = st.slider("Electromagnetic Force (α)", axes["alpha"].start, axes["alpha"].stop,
+                      step=axes["alpha"].step, key="alpha")
+    strong_force = st.slider("Strong Nuclear Force", axes["strong_force"].start, axes["strong_force"].stop,
+                             step=axes["strong_force"].step, key="strong_force")
+    lambda_const = st.slider("Cosmological Constant (Λ)", axes["lambda_const"].start, axes["lambda_const"].stop,
+                             step=axes["lambda_const"].step, key="lambda_const")
+    if coalesce_sliders:
+        st.form_submit_button("Apply Constants")
+
+# Seed for the simulation's PRNG: the same constants and seed always replay the same universe
+st.sidebar.header("🎲 **Simulation Seed**")
+sim_seed = st.sidebar.number_input("Seed", min_value=0, max_value=2**32 - 1, value=42, step=1)
+resume_snapshots = st.sidebar.checkbox("Resume saved universe snapshots", value=True)
+
+# Thin clients can watch a universe stepped on the server instead of running p5.js themselves
+sim_mode = st.sidebar.radio("Simulation Mode", ["In-browser (p5.js)", "Server-streamed (thin clients)"])
 
 st.markdown("---")
 st.header("📏 Real-World Physical Constants")
@@ -85,19 +121,52 @@ for val in fine_tuning_data["Visualization"]:
         log_val = 0
     log_values.append(log_val)
 
-# Create horizontal bars showing precision (higher = more fine-tuned)
-fig, ax = plt.subplots(figsize=(8, 3))
-bars = ax.barh(fine_tuning_data["Constant"], log_values, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'])
+cache_dir = os.environ.get("SPACE_SIM_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
 
-# Add labels showing the precision values
-for i, bar in enumerate(bars):
-    ax.text(bar.get_width() + 1, bar.get_y() + bar.get_height() / 2,
-            fine_tuning_data["Viable Range"][i],
-            va='center', color='black')
 
-ax.set_xlabel('Fine-Tuning Precision (log scale)')
-ax.set_title('Relative Fine-Tuning Precision of Fundamental Constants')
-st.pyplot(fig)
+# Disk cache shared by every worker process and replica on this machine. Its version hash covers the model,
+# the rules table, the viability index and this file's chart code, so stale results are never served after an edit.
+@st.cache_resource
+def get_result_cache():
+    return result_cache.ResultCache(
+        os.path.join(cache_dir, "results.sqlite"),
+        result_cache.model_version(universe_model.__file__, viability_rules.__file__, viability_index.__file__,
+                                   __file__),
+        max_bytes=int(os.environ.get("SPACE_SIM_CACHE_MB", 256)) * 1024 * 1024)
+
+
+results = get_result_cache()
+
+
+# Figures are rendered to PNG once per input and cached, so reruns only pay for the ones that changed
+def figure_to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+@st.cache_data
+@results.memoize("fine_tuning_chart")
+def render_fine_tuning_chart(constants, log_values, viable_ranges):
+    # Create horizontal bars showing precision (higher = more fine-tuned)
+    fig, ax = plt.subplots(figsize=(8, 3))
+    bars = ax.barh(constants, log_values, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'])
+
+    # Add labels showing the precision values
+    for i, bar in enumerate(bars):
+        ax.text(bar.get_width() + 1, bar.get_y() + bar.get_height() / 2,
+                viable_ranges[i],
+                va='center', color='black')
+
+    ax.set_xlabel('Fine-Tuning Precision (log scale)')
+    ax.set_title('Relative Fine-Tuning Precision of Fundamental Constants')
+    return figure_to_png(fig)
+
+
+st.image(render_fine_tuning_chart(tuple(fine_tuning_data["Constant"]), tuple(log_values),
+                                  tuple(fine_tuning_data["Viable Range"])),
+         width="stretch")
 
 st.markdown("""
 ### What does this mean?
@@ -119,54 +188,52 @@ st.subheader("Effect of Chaning Constants:")
 # Columns for categories
 col1, col2 = st.columns(2)
 
-score = 0
+# Every threshold lives in viability_rules, which also generates the simulation's constants
+verdicts = viability_rules.verdicts(G=G, alpha=alpha, strong_force=strong_force, lambda_const=lambda_const)
+score = int(viability_rules.threshold_score(G, alpha, strong_force, lambda_const))
 
 with col1:
     st.subheader("🪐 Gravity (G)")
-    if G < 0.3:
+    if verdicts["G"] == LOW:
         st.error("❌ Too weak — No stars or galaxies form.")
-    elif G > 3.0:
+    elif verdicts["G"] == HIGH:
         st.error("❌ Too strong — Stars collapse quickly.")
     else:
         st.success("✅ Gravity supports stable star formation.")
-        score += 1
     with st.expander("What This Means"):
         st.write(
             "Gravity affects how matter clumps together. Too little, and stars never ignite. Too much, and everything collapses rapidly.")
 
 with col2:
     st.subheader("⚡ Electromagnetism (α)")
-    if alpha < 0.05:
+    if verdicts["alpha"] == LOW:
         st.error("❌ Atoms unstable — chemistry fails.")
-    elif alpha > 1.5:
+    elif verdicts["alpha"] == HIGH:
         st.error("❌ Electron orbits collapse.")
     else:
         st.success("✅ Supports stable atoms and chemistry.")
-        score += 1
     with st.expander("What This Means"):
         st.write("This force holds atoms together. Tweak it too much, and atoms can't exist.")
 
 with col1:
     st.subheader("💥 Strong Nuclear Force")
-    if strong_force < 0.3:
+    if verdicts["strong_force"] == LOW:
         st.error("❌ No nuclei form — just protons.")
-    elif strong_force > 5.0:
+    elif verdicts["strong_force"] == HIGH:
         st.error("❌ Hydrogen fuses instantly — stars don't last.")
     else:
         st.success("✅ Enables atomic nuclei and fusion.")
-        score += 1
     with st.expander("What This Means"):
         st.write("This force binds protons and neutrons. Without it, matter can't exist beyond hydrogen.")
 
 with col2:
     st.subheader("🌌 Cosmological Constant (Λ)")
-    if lambda_const < 0.01:
+    if verdicts["lambda_const"] == LOW:
         st.warning("⚠️ Universe collapses early.")
-    elif lambda_const > 1.5:
+    elif verdicts["lambda_const"] == HIGH:
         st.error("❌ Expands too fast — no galaxies form.")
     else:
         st.success("✅ Balanced cosmic expansion.")
-        score += 1
     with st.expander("What This Means"):
         st.write("This controls the expansion of the universe. It must be finely tuned to allow structure to form.")
 
@@ -181,23 +248,62 @@ status = {
 }
 st.markdown(f"## {status[score]} ({score}/4)")
 
+
+# Verdicts for every slider combination, built once and then memory-mapped by each worker
+@st.cache_resource(show_spinner="Indexing every possible universe...")
+def get_viability_index():
+    return viability_index.ViabilityIndex.load_or_build(cache_dir)
+
+
+@st.cache_data
+@results.memoize("viable_share")
+def viable_share():
+    return get_viability_index().count(plane="threshold") / np.prod([axis.count for axis in viability_index.AXES])
+
+
+@st.cache_data(max_entries=1024)
+def nearest_habitable(G, alpha, strong_force, lambda_const):
+    return get_viability_index().nearest(G, alpha, strong_force, lambda_const, plane="threshold")
+
+
+def snap_to(constants):
+    for key, value in zip(["G", "alpha", "strong_force", "lambda_const"], constants):
+        st.session_state[key] = value
+
+
+# Same definition as the headline above: all four constants in range (4/4)
+if score < 4:
+    nearest = nearest_habitable(G, alpha, strong_force, lambda_const)
+    if nearest is not None:
+        st.info("🧭 Nearest life-permitting universe: G = {:.1f}, α = {:.2f}, Strong Force = {:.1f}, Λ = {:.2f}"
+                .format(*nearest))
+        st.button("Snap to Nearest Habitable Universe", on_click=snap_to, args=(nearest,))
+st.caption(f"Only {viable_share():.2%} of all possible slider combinations are life-permitting.")
+
 # Visualizing Parameter Differences
 st.markdown("### 📊 How Far From Home?")
 params = ["Gravity (G)", "Electromagnetism (α)", "Strong Force", "Cosmological Const. (Λ)"]
 values = [G, alpha, strong_force, lambda_const]
 real_values = [1, 1, 1, 1]
 
-fig, ax = plt.subplots(figsize=(6, 3))
-bar_width = 0.35
-x = np.arange(len(params))
-ax.bar(x - bar_width / 2, real_values, bar_width, label='Real Universe')
-ax.bar(x + bar_width / 2, values, bar_width, label='Your Universe', color='coral')
-ax.set_ylabel("Relative Value (Scaled)")
-ax.set_title("Comparison of Constants")
-ax.set_xticks(x)
-ax.set_xticklabels(params, rotation=15)
-ax.legend()
-st.pyplot(fig)
+
+@st.cache_data(max_entries=512)
+@results.memoize("comparison_chart")
+def render_comparison_chart(values):
+    fig, ax = plt.subplots(figsize=(6, 3))
+    bar_width = 0.35
+    x = np.arange(len(params))
+    ax.bar(x - bar_width / 2, real_values, bar_width, label='Real Universe')
+    ax.bar(x + bar_width / 2, values, bar_width, label='Your Universe', color='coral')
+    ax.set_ylabel("Relative Value (Scaled)")
+    ax.set_title("Comparison of Constants")
+    ax.set_xticks(x)
+    ax.set_xticklabels(params, rotation=15)
+    ax.legend()
+    return figure_to_png(fig)
+
+
+st.image(render_comparison_chart(tuple(values)), width="stretch")
 
 # Footer
 st.markdown("---")
@@ -205,51 +311,43 @@ st.info(
     "These are simplified approximations based on physics insights from cosmology and fine-tuning arguments. In reality, the interactions between constants are complex and non-linear.")
 
 # Section 2:
-# Combined "health scores"
-star_score = 1.0 / (G * strong_force)
-atom_score = alpha / (strong_force + 0.1)
-cosmos_score = G / (lambda_const + 0.1)
-
-life_score = (star_score * atom_score * cosmos_score) ** (1 / 3)
-
 st.header("🔎 Interdependent Effects")
 
 # Calculate health scores (simplified)
-star_score = 1.0 / (G * strong_force)
-atom_score = alpha / (strong_force + 0.1)
-cosmos_score = G / (lambda_const + 0.1)
-life_score = (star_score * atom_score * cosmos_score) ** (1 / 3)
+star_score, atom_score, cosmos_score, life_score = universe_model.health_scores(G, alpha, strong_force, lambda_const)
+verdicts.update(viability_rules.verdicts(star_score=star_score, atom_score=atom_score,
+                                         cosmos_score=cosmos_score, life_score=life_score))
 
 # Star system viability
 st.subheader("⭐ Star Formation & Stability")
-if star_score < 0.1:
+if verdicts["star_score"] == LOW:
     st.error("Too little star formation — gravity or fusion is failing.")
-elif star_score > 10:
+elif verdicts["star_score"] == HIGH:
     st.error("Stars form too rapidly and burn out instantly.")
 else:
     st.success("Star formation occurs at a stable, life-supporting rate.")
 
 # Atomic bonding
 st.subheader("🧪 Atomic & Chemical Stability")
-if atom_score < 0.05:
+if verdicts["atom_score"] == LOW:
     st.error("No stable atoms — chemistry collapses.")
-elif atom_score > 5.0:
+elif verdicts["atom_score"] == HIGH:
     st.warning("Extreme bonding — weird chemistry may dominate.")
 else:
     st.success("Atoms can form stable, diverse chemical structures.")
 
 # Cosmic expansion
 st.subheader("🌠 Cosmic Expansion Balance")
-if cosmos_score < 0.2:
+if verdicts["cosmos_score"] == LOW:
     st.error("Universe collapses too soon — gravity dominates.")
-elif cosmos_score > 10:
+elif verdicts["cosmos_score"] == HIGH:
     st.error("Universe expands too fast — no structures can form.")
 else:
     st.success("Expansion is balanced with gravitational pull.")
 
 # Overall Life-Permitting Score
 st.subheader("🌱 Life Potential")
-if life_score > 0.5 and life_score < 5.0:
+if verdicts["life_score"] == OK:
     st.success("This universe might support life!")
 else:
     st.warning("Too many physical extremes — unlikely to be life-permitting.")
@@ -264,25 +362,25 @@ st.subheader("🧠 Why This Universe Behaves This Way")
 explanation = []
 
 # Gravity and strong force impact star formation
-if star_score < 0.1:
+if verdicts["star_score"] == LOW:
     explanation.append("Gravity or the strong force is too weak — stars cannot form or sustain fusion.")
-elif star_score > 10:
+elif verdicts["star_score"] == HIGH:
     explanation.append("Stars form too rapidly and burn out quickly due to overly strong gravity or fusion forces.")
 else:
     explanation.append("Star formation appears stable and sustained.")
 
 # Electromagnetic + strong force impact atoms
-if atom_score < 0.05:
+if verdicts["atom_score"] == LOW:
     explanation.append("The electromagnetic force is too weak to bind electrons to nuclei — chemistry collapses.")
-elif atom_score > 5.0:
+elif verdicts["atom_score"] == HIGH:
     explanation.append("Bonding is too intense — exotic chemistry may dominate.")
 else:
     explanation.append("Atomic structure is stable, allowing for complex molecules.")
 
 # G and Λ impact cosmic structure
-if cosmos_score < 0.2:
+if verdicts["cosmos_score"] == LOW:
     explanation.append("Gravity overwhelms expansion — the universe collapses prematurely.")
-elif cosmos_score > 10:
+elif verdicts["cosmos_score"] == HIGH:
     explanation.append("Expansion dominates — matter never forms galaxies.")
 else:
     explanation.append("Cosmic expansion and gravitational attraction are well-balanced.")
@@ -295,32 +393,31 @@ st.subheader("📈 Life Potential Across G and Λ")
 
 G_vals = np.linspace(0.1, 10, 50)
 L_vals = np.linspace(0.01, 2.0, 50)
-Z = []
-
-for g in G_vals:
-    row = []
-    for lam in L_vals:
-        star = 1.0 / (g * strong_force)
-        cosmos = g / (lam + 0.1)
-        atom = alpha / (strong_force + 0.1)
-        life = (star * atom * cosmos) ** (1 / 3)
-        row.append(life)
-    Z.append(row)
-
-fig = go.Figure(data=go.Heatmap(
-    z=Z,
-    x=L_vals,
-    y=G_vals,
-    colorscale="Viridis",
-    colorbar=dict(title="Life Score")
-))
-fig.update_layout(
-    xaxis_title="Cosmological Constant (Λ)",
-    yaxis_title="Gravitational Constant (G)",
-    title="Life Potential as G and Λ Vary",
-    height=500
-)
-st.plotly_chart(fig, use_container_width=True)
+
+
+# The heatmap only depends on α and the strong force, so dragging G or Λ reuses it
+@st.cache_data(max_entries=512)
+@results.memoize("life_heatmap")
+def build_life_heatmap(alpha, strong_force):
+    Z = universe_model.life_score_grid(alpha, strong_force, G_vals, L_vals)
+
+    fig = go.Figure(data=go.Heatmap(
+        z=Z,
+        x=L_vals,
+        y=G_vals,
+        colorscale="Viridis",
+        colorbar=dict(title="Life Score")
+    ))
+    fig.update_layout(
+        xaxis_title="Cosmological Constant (Λ)",
+        yaxis_title="Gravitational Constant (G)",
+        title="Life Potential as G and Λ Vary",
+        height=500
+    )
+    return fig
+
+
+st.plotly_chart(build_life_heatmap(alpha, strong_force), use_container_width=True)
 
 # Universe Simulation Section
 st.title("⚛️ Interactive Universe Simulation")
@@ -344,6 +441,7 @@ p5_html = f"""
     let universeState = "Forming";
     let starCount = 0;
     let galaxyFormed = false;
+    let frame = 0;
 
     // Constants from sliders
     const G_VALUE = {G};
@@ -351,18 +449,58 @@ p5_html = f"""
     const STRONG_FORCE = {strong_force};
     const LAMBDA_VALUE = {lambda_const};
 
+    // Viability bands, generated from the same rules table as the checks above
+    {viability_rules.js_constants()}
+    const SEED = {int(sim_seed)};
+    const RESUME_SNAPSHOTS = {str(resume_snapshots).lower()};
+
+    // Snapshots are stored per (constants, seed): identical pairs always give identical universes
+    const SNAPSHOT_KEY = `universe-sim:${{G_VALUE}}:${{ALPHA_VALUE}}:${{STRONG_FORCE}}:${{LAMBDA_VALUE}}:${{SEED}}`;
+    const SNAPSHOT_INTERVAL = 60;
+    let resumedFrom = null;
+
+    // Counter-based PRNG: each draw hashes (seed, counter), so the whole generator state is one integer
+    function hash32(seed, counter) {{
+      let h = (Math.imul(seed, 0x27D4EB2D) + Math.imul(counter, 0x9E3779B1)) >>> 0;
+      h = Math.imul(h ^ (h >>> 16), 0x85EBCA6B);
+      h = Math.imul(h ^ (h >>> 13), 0xC2B2AE35);
+      return (h ^ (h >>> 16)) >>> 0;
+    }}
+
+    const rng = {{
+      counter: 0,
+
+      next() {{
+        return hash32(SEED, this.counter++) / 4294967296;
+      }},
+
+      // Same signature as p.random: random(max) or random(min, max)
+      random(lo, hi) {{
+        if (hi === undefined) {{
+          hi = lo;
+          lo = 0;
+        }}
+        return lo + this.next() * (hi - lo);
+      }}
+    }};
+
+    // The background starfield is a pure function of (frame, star), so it never advances the main stream
+    function starfieldRandom(i, channel) {{
+      return hash32(SEED ^ 0x5BD1E995, (frame * 100 + i) * 3 + channel) / 4294967296;
+    }}
+
     class Particle {{
       constructor(x, y) {{
-        this.pos = p.createVector(x || p.random(0, p.width), y || p.random(0, p.height));
-        this.vel = p.createVector(p.random(-0.5, 0.5), p.random(-0.5, 0.5));
+        this.pos = p.createVector(x || rng.random(0, p.width), y || rng.random(0, p.height));
+        this.vel = p.createVector(rng.random(-0.5, 0.5), rng.random(-0.5, 0.5));
         this.acc = p.createVector(0, 0);
-        this.mass = p.random(0.5, 1.5);
+        this.mass = rng.random(0.5, 1.5);
         this.size = this.mass * 4;
         this.color = p.color(255, 255, 255);
         this.type = "matter";
         this.lifespan = 1000;
         this.stable = true;
-        this.energy = p.random(0, 10);
+        this.energy = rng.random(0, 10);
       }}
 
       applyForce(force) {{
@@ -416,18 +554,18 @@ p5_html = f"""
         this.lifespan--;
 
         // Strong and alpha forces affect stability
-        if (STRONG_FORCE < 0.3 || ALPHA_VALUE < 0.05) {{
+        if (below("strong_force", STRONG_FORCE) || below("alpha", ALPHA_VALUE)) {{
           this.stable = false;
           this.color = p.color(255, 0, 0);  // Unstable - red
-          if (p.random(1) < 0.01) this.disintegrate();
+          if (rng.random(1) < 0.01) this.disintegrate();
         }}
-        else if (STRONG_FORCE > 5 || ALPHA_VALUE > 1.5) {{
+        else if (above("strong_force", STRONG_FORCE) || above("alpha", ALPHA_VALUE)) {{
           this.color = p.color(255, 165, 0);  // Extreme - orange
-          if (p.random(1) < 0.005 && stars.length < 15) this.formStar();
+          if (rng.random(1) < 0.005 && stars.length < 15) this.formStar();
         }}
         else {{
           this.color = p.color(0, 255, 255);  // Stable - cyan
-          if (p.random(1) < 0.002 && stars.length < 20) this.formStar();
+          if (rng.random(1) < 0.002 && stars.length < 20) this.formStar();
         }}
 
         // Boundary wrap
@@ -438,7 +576,7 @@ p5_html = f"""
       }}
 
       formStar() {{
-        if (G_VALUE > 0.3 && G_VALUE < 3.0) {{
+        if (inBand("G", G_VALUE)) {{
           stars.push(new Star(this.pos.x, this.pos.y));
           this.lifespan = 0; // Consume the particle
         }}
@@ -461,16 +599,31 @@ p5_html = f"""
       isDead() {{
         return this.lifespan <= 0;
       }}
+
+      serialize() {{
+        return ["P", this.pos.x, this.pos.y, this.vel.x, this.vel.y, this.mass, this.size,
+                this.lifespan, this.stable ? 1 : 0, this.energy, ...this.color.levels];
+      }}
+
+      restore(s) {{
+        this.pos.set(s[1], s[2]);
+        this.vel.set(s[3], s[4]);
+        [this.mass, this.size, this.lifespan] = [s[5], s[6], s[7]];
+        this.stable = s[8] === 1;
+        this.energy = s[9];
+        this.color = p.color(s[10], s[11], s[12], s[13]);
+        return this;
+      }}
     }}
 
     class Star {{
       constructor(x, y) {{
         this.pos = p.createVector(x, y);
-        this.mass = p.random(3, 8);
+        this.mass = rng.random(3, 8);
         this.size = this.mass * 2;
-        this.lifespan = p.random(500, 2000);
+        this.lifespan = rng.random(500, 2000);
         this.color = p.color(255, 255, 100);
-        this.pulseRate = p.random(0.02, 0.05);
+        this.pulseRate = rng.random(0.02, 0.05);
         this.pulseAmount = 0;
         starCount++;
       }}
@@ -506,6 +659,17 @@ p5_html = f"""
         return this.lifespan <= 0;
       }}
 
+      serialize() {{
+        return ["S", this.pos.x, this.pos.y, this.mass, this.size, this.lifespan,
+                this.pulseRate, this.pulseAmount, ...this.color.levels];
+      }}
+
+      restore(s) {{
+        [this.mass, this.size, this.lifespan, this.pulseRate, this.pulseAmount] = [s[3], s[4], s[5], s[6], s[7]];
+        this.color = p.color(s[8], s[9], s[10], s[11]);
+        return this;
+      }}
+
       explode() {{
         // Supernova
         for (let i = 0; i < 20; i++) {{
@@ -513,7 +677,7 @@ p5_html = f"""
         }}
 
         // Small chance to form black hole
-        if (G_VALUE > 2.0 && p.random(1) < 0.3) {{
+        if (G_VALUE > 2.0 && rng.random(1) < 0.3) {{
           let blackHole = new BlackHole(this.pos.x, this.pos.y);
           stars.push(blackHole);
         }}
@@ -535,6 +699,15 @@ p5_html = f"""
         this.lifespan--;
       }}
 
+      serialize() {{
+        return ["B", this.pos.x, this.pos.y, this.lifespan];
+      }}
+
+      restore(s) {{
+        this.lifespan = s[3];
+        return this;
+      }}
+
       draw() {{
         // Accretion disk
         p.noStroke();
@@ -554,9 +727,9 @@ p5_html = f"""
     class DisintegrationParticle extends Particle {{
       constructor(x, y) {{
         super(x, y);
-        this.lifespan = p.random(20, 60);
-        this.vel = p5.Vector.random2D().mult(p.random(1, 3));
-        this.size = p.random(1, 3);
+        this.lifespan = rng.random(20, 60);
+        this.vel = p5.Vector.fromAngle(rng.random(0, p.TWO_PI)).mult(rng.random(1, 3));
+        this.size = rng.random(1, 3);
         this.color = p.color(255, 200, 100);
       }}
 
@@ -566,6 +739,10 @@ p5_html = f"""
         this.color = p.color(255, 200, 100, this.lifespan * 4);
       }}
 
+      serialize() {{
+        return ["D", ...super.serialize().slice(1)];
+      }}
+
       draw() {{
         p.noStroke();
         p.fill(this.color);
@@ -579,19 +756,19 @@ p5_html = f"""
         return "Big Bang Phase";
       }}
 
-      if (LAMBDA_VALUE > 1.5) {{
+      if (above("lambda_const", LAMBDA_VALUE)) {{
         return "Rapid Expansion - Particles Too Dispersed";
       }}
 
-      if (G_VALUE < 0.3) {{
+      if (below("G", G_VALUE)) {{
         return "Gravity Too Weak - No Structure Formation";
       }}
 
-      if (G_VALUE > 3.0) {{
+      if (above("G", G_VALUE)) {{
         return "Gravity Too Strong - Rapid Collapse";
       }}
 
-      if (STRONG_FORCE < 0.3 || ALPHA_VALUE < 0.05) {{
+      if (below("strong_force", STRONG_FORCE) || below("alpha", ALPHA_VALUE)) {{
         return "Unstable Matter - Chemistry Impossible";
       }}
 
@@ -609,37 +786,85 @@ p5_html = f"""
 
       let explanation = `<strong>Universe State: ${{currentState}}</strong><br><br>`;
 
-      if (G_VALUE < 0.3) {{
+      if (below("G", G_VALUE)) {{
         explanation += "Low gravity prevents matter from clumping to form stars.<br>";
-      }} else if (G_VALUE > 3.0) {{
+      }} else if (above("G", G_VALUE)) {{
         explanation += "Extreme gravity causes rapid collapse of structures.<br>";
       }}
 
-      if (LAMBDA_VALUE > 1.5) {{
+      if (above("lambda_const", LAMBDA_VALUE)) {{
         explanation += "High cosmological constant causes universe to expand too quickly.<br>";
       }}
 
-      if (STRONG_FORCE < 0.3) {{
+      if (below("strong_force", STRONG_FORCE)) {{
         explanation += "Weak nuclear force prevents stable atomic nuclei.<br>";
-      }} else if (STRONG_FORCE > 5.0) {{
+      }} else if (above("strong_force", STRONG_FORCE)) {{
         explanation += "Strong nuclear force causes rapid fusion and unstable stars.<br>";
       }}
 
-      if (ALPHA_VALUE < 0.05) {{
+      if (below("alpha", ALPHA_VALUE)) {{
         explanation += "Weak electromagnetic force prevents stable atoms.<br>";
-      }} else if (ALPHA_VALUE > 1.5) {{
+      }} else if (above("alpha", ALPHA_VALUE)) {{
         explanation += "Strong electromagnetic force causes electron orbits to collapse.<br>";
       }}
 
       explanationDiv.innerHTML = explanation;
     }}
 
+    // Compact snapshot of the full simulation state, including the PRNG counter
+    function serializeState() {{
+      return JSON.stringify({{
+        v: 1,
+        rng: rng.counter,
+        frame: frame,
+        age: universeAge,
+        starCount: starCount,
+        galaxyFormed: galaxyFormed,
+        particles: particles.map(pt => pt.serialize()),
+        stars: stars.map(s => s.serialize())
+      }});
+    }}
+
+    function restoreState(json) {{
+      const snap = JSON.parse(json);
+      const kinds = {{ P: Particle, D: DisintegrationParticle, S: Star, B: BlackHole }};
+      const rebuild = s => new kinds[s[0]](s[1], s[2]).restore(s);
+
+      particles = snap.particles.map(rebuild);
+      stars = snap.stars.map(rebuild);
+
+      // Constructors above draw from the PRNG and count stars, so the counters are restored last
+      rng.counter = snap.rng;
+      frame = snap.frame;
+      universeAge = snap.age;
+      starCount = snap.starCount;
+      galaxyFormed = snap.galaxyFormed;
+    }}
+
+    // sessionStorage may be unavailable inside a sandboxed iframe, so snapshots are best-effort
+    function loadSnapshot() {{
+      try {{
+        return window.sessionStorage.getItem(SNAPSHOT_KEY);
+      }} catch (e) {{
+        return null;
+      }}
+    }}
+
+    function saveSnapshot() {{
+      try {{
+        window.sessionStorage.setItem(SNAPSHOT_KEY, serializeState());
+      }} catch (e) {{
+        // Storage full or blocked - the simulation just won't resume next time
+      }}
+    }}
+
     function updateControls() {{
       const controlsDiv = document.getElementById('controls-overlay');
       // Fix: universeAge is accessible here because it's defined at the top of the p5 function
       let content = `<strong>Universe Age:</strong> ${{Math.floor(universeAge)}}<br>`;
       content += `<strong>Stars:</strong> ${{stars.length}}<br>`;
       content += `<strong>Particles:</strong> ${{particles.length}}<br>`;
+      content += `<strong>Seed:</strong> ${{SEED}}${{resumedFrom !== null ? ` (resumed at frame ${{resumedFrom}})` : ""}}<br>`;
       content += `<strong>Constants:</strong><br>`;
       content += `G: ${{G_VALUE.toFixed(1)}} | α: ${{ALPHA_VALUE.toFixed(2)}} | Strong: ${{STRONG_FORCE.toFixed(1)}} | Λ: ${{LAMBDA_VALUE.toFixed(2)}}`;
 
@@ -650,6 +875,14 @@ p5_html = f"""
       let canvas = p.createCanvas(700, 500);
       canvas.parent('canvas-container');
 
+      // Identical constants and seed give an identical universe, so a saved snapshot can be served as-is
+      const snapshot = RESUME_SNAPSHOTS ? loadSnapshot() : null;
+      if (snapshot) {{
+        restoreState(snapshot);
+        resumedFrom = frame;
+        return;
+      }}
+
       // Initialize particles
       for (let i = 0; i < 80; i++) {{
         particles.push(new Particle());
@@ -657,8 +890,8 @@ p5_html = f"""
 
       // Create initial central concentration for Big Bang
       for (let i = 0; i < 20; i++) {{
-        let angle = p.random(0, p.TWO_PI);
-        let radius = p.random(0, 50);
+        let angle = rng.random(0, p.TWO_PI);
+        let radius = rng.random(0, 50);
         let x = p.width/2 + p.cos(angle) * radius;
         let y = p.height/2 + p.sin(angle) * radius;
         particles.push(new Particle(x, y));
@@ -671,15 +904,15 @@ p5_html = f"""
 
       // Draw distant stars (background)
       for (let i = 0; i < 100; i++) {{
-        p.stroke(255, 255, 255, p.random(100, 255));
-        p.point(p.random(p.width), p.random(p.height));
+        p.stroke(255, 255, 255, 100 + starfieldRandom(i, 0) * 155);
+        p.point(starfieldRandom(i, 1) * p.width, starfieldRandom(i, 2) * p.height);
       }}
 
       // Update universe age
       universeAge += 0.2;
 
       // Check for galaxy formation
-      if (stars.length > 5 && !galaxyFormed && G_VALUE >= 0.3 && G_VALUE <= 3.0) {{
+      if (stars.length > 5 && !galaxyFormed && inBand("G", G_VALUE)) {{
         galaxyFormed = true;
       }}
 
@@ -736,20 +969,59 @@ p5_html = f"""
       }}
 
       // Add new particles occasionally to maintain population
-      if (particles.length < 50 && p.frameCount % 30 === 0) {{
+      if (particles.length < 50 && frame % 30 === 0) {{
         particles.push(new Particle());
       }}
 
       // Update UI elements
       updateControls();
       updateExplanation();
+
+      frame++;
+      if (frame % SNAPSHOT_INTERVAL === 0) {{
+        saveSnapshot();
+      }}
     }};
   }}, 'universe-sim');
 </script>
 """
 
-# Display the improved P5.js sketch using Streamlit components
-st.components.v1.html(p5_html, height=550)
+
+# One stream server per host: the first Streamlit process binds the port and its siblings reuse it
+@st.cache_resource
+def get_stream_server(port):
+    return universe_stream.start_server(port=port)
+
+
+def default_stream_url(port):
+    # The viewer's browser connects directly, so use the host it reached the app on - not localhost
+    host = urlparse(st.context.url or "http://localhost").hostname or "localhost"
+    host = f"[{host}]" if ":" in host else host
+    return f"http://{host}:{port}"
+
+
+if sim_mode == "Server-streamed (thin clients)":
+    stream_port = int(os.environ.get("UNIVERSE_STREAM_PORT", 8502))
+    stream_url = os.environ.get("UNIVERSE_STREAM_URL")
+    try:
+        get_stream_server(stream_port)
+    except OSError as error:
+        st.error(f"Couldn't start the simulation stream server on port {stream_port}: {error}")
+    else:
+        if stream_url is None and (st.context.url or "").startswith("https:"):
+            st.warning("This page is served over HTTPS, so browsers block the plain-HTTP stream on port "
+                       f"{stream_port}. Proxy the stream server under the app's origin and point "
+                       "UNIVERSE_STREAM_URL at it.")
+        st.components.v1.html(
+            universe_stream.renderer_html(stream_url or default_stream_url(stream_port),
+                                          G, alpha, strong_force, lambda_const, int(sim_seed)),
+            height=550)
+        st.caption("Stepped on the server and streamed as compact frame deltas - everyone watching the same "
+                   f"constants and seed shares one simulation. The stream is served on port {stream_port} "
+                   "(UNIVERSE_STREAM_PORT); set UNIVERSE_STREAM_URL when viewers reach it at a different address.")
+else:
+    # Display the improved P5.js sketch using Streamlit components
+    st.components.v1.html(p5_html, height=550)
 
 # Add explanation for simulation
 st.markdown("""
@@ -759,6 +1031,7 @@ st.markdown("""
 - **Black Holes**: Can form when stars collapse under strong gravity
 - **Universe Age**: Shows the progression of the simulated universe
 - **Universe State**: Dynamically explains if this universe could support life
+- **Seed**: The same constants and seed always replay the same universe, and a saved snapshot resumes it where it left off
 
 ### Color Coding
 - **Cyan**: Stable atoms and chemistry (life-supporting)
@@ -0,0 +1,151 @@
+"""Persistent result cache shared by every Streamlit worker on the machine.
+
+Results are pickled into a single SQLite file (WAL mode, so lookups never wait
+on writers), keyed by namespace, arguments and a model version hash. A freshly
+started worker therefore comes up warm with everything its siblings computed.
+The cache is best-effort: if the database is locked or unreadable the value is
+simply recomputed.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from importlib import metadata
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Writers wait this long for the lock; hits never wait, they just skip the access-time update
+BUSY_TIMEOUT_MS = 2000
+# Access times are only refreshed once they are this stale, so most hits are pure reads
+ACCESS_RESOLUTION = 60
+# Cached grids and figures are pickled objects from these libraries
+LIBRARIES = ("numpy", "matplotlib", "plotly")
+
+
+def model_version(*paths, libraries=LIBRARIES):
+    """Hash of the source files and library versions behind cached results - changing any of them invalidates the cache."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    for library in libraries:
+        try:
+            digest.update(f"{library}=={metadata.version(library)}".encode())
+        except metadata.PackageNotFoundError:
+            digest.update(f"{library} missing".encode())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    def __init__(self, path, version, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("CREATE TABLE IF NOT EXISTS results ("
+                           "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+                db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self.enabled = True
+        except (OSError, sqlite3.Error):
+            # Unwritable cache directory or a locked database - every lookup misses and nothing is stored
+            self.enabled = False
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, so each script thread gets its own
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.db = db
+        return db
+
+    def _key(self, namespace, args):
+        return hashlib.sha256(repr((self.version, namespace, args)).encode()).hexdigest()
+
+    def _write_if_idle(self, db, sql, params):
+        # Bookkeeping writes are skipped rather than queued behind another worker's transaction
+        db.execute("PRAGMA busy_timeout=0")
+        try:
+            db.execute(sql, params)
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+
+    def get(self, namespace, args, default=None):
+        if not self.enabled:
+            return default
+        key = self._key(namespace, args)
+        try:
+            db = self._connect()
+            row = db.execute("SELECT value, accessed FROM results WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return default
+        if row is None:
+            return default
+
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # Unreadable blob, e.g. a pickled class that has since moved - drop it and recompute
+            self._write_if_idle(db, "DELETE FROM results WHERE key = ?", (key,))
+            return default
+
+        now = time.time()
+        if now - row[1] > ACCESS_RESOLUTION:
+            self._write_if_idle(db, "UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return value
+
+    def set(self, namespace, args, value):
+        if not self.enabled:
+            return
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                           (self._key(namespace, args), blob, len(blob), time.time()))
+                self._evict(db)
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, db):
+        # Least recently used entries go first, down to 90% of the budget so eviction isn't run on every insert
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for key, size in db.execute("SELECT key, size FROM results ORDER BY accessed").fetchall():
+            if total <= target:
+                break
+            db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    def memoize(self, namespace):
+        """Decorator caching a function's results under namespace, keyed by its (hashable, repr-stable) arguments."""
+        missing = object()
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                value = self.get(namespace, args, missing)
+                if value is missing:
+                    value = func(*args)
+                    self.set(namespace, args, value)
+                return value
+            return wrapper
+        return decorator
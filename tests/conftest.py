@@ -0,0 +1,55 @@
+import ast
+import json
+import pathlib
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import viability_rules
+
+SPACE_SIM = pathlib.Path(__file__).resolve().parent.parent / "Space_Sim.py"
+
+
+def run_node(script):
+    return subprocess.run(["node", "-"], input=script, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def node():
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+    return run_node
+
+
+@pytest.fixture
+def hash32_vectors():
+    """hash32(seed, counter) for the p5 sketch's generator, pinned so a refactor can't silently reshuffle every universe."""
+    return [((42, 0), 2156391293), ((42, 12345), 1874725194), ((4294967295, 999999), 4259709710)]
+
+
+@pytest.fixture
+def js_hash32(node):
+    # The sketch lives in an f-string, so its braces are doubled
+    match = re.search(r"function hash32\(seed, counter\) \{\{.*?\n    \}\}", SPACE_SIM.read_text(), re.S)
+    source = match.group(0).replace("{{", "{").replace("}}", "}")
+
+    def js_hash32(pairs):
+        return json.loads(node(f"{source}\nconsole.log(JSON.stringify({json.dumps(pairs)}.map(([s, c]) => hash32(s, c))));"))
+    return js_hash32
+
+
+@pytest.fixture
+def p5_sketch():
+    """The p5 sketch script Space_Sim.py embeds, rendered for the given constants and seed."""
+    tree = ast.parse(SPACE_SIM.read_text())
+    template = next(node.value for node in tree.body
+                    if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "p5_html")
+    code = compile(ast.Expression(template), str(SPACE_SIM), "eval")
+
+    def render(G=1.0, alpha=1.0, strong_force=1.0, lambda_const=1.0, seed=42, resume_snapshots=True):
+        html = eval(code, {"viability_rules": viability_rules, "G": G, "alpha": alpha, "strong_force": strong_force,
+                           "lambda_const": lambda_const, "sim_seed": seed, "resume_snapshots": resume_snapshots})
+        return re.findall(r"<script>(.*?)</script>", html, re.S)[-1]
+    return render
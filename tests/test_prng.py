@@ -0,0 +1,60 @@
+import json
+
+# Just enough of p5 for the sketch's simulation to run headless; drawing calls are no-ops
+P5_STUB = """
+class Vector {
+  constructor(x = 0, y = 0) { this.x = x; this.y = y; }
+  add(o) { this.x += o.x; this.y += o.y; return this; }
+  mult(s) { this.x *= s; this.y *= s; return this; }
+  mag() { return Math.sqrt(this.x * this.x + this.y * this.y); }
+  normalize() { const m = this.mag(); if (m !== 0) { this.x /= m; this.y /= m; } return this; }
+  limit(max) { const m = this.mag(); if (m > max) { this.x *= max / m; this.y *= max / m; } return this; }
+  set(x, y) { this.x = x; this.y = y; return this; }
+  static sub(a, b) { return new Vector(a.x - b.x, a.y - b.y); }
+  static div(a, s) { return new Vector(a.x / s, a.y / s); }
+  static fromAngle(a) { return new Vector(Math.cos(a), Math.sin(a)); }
+}
+
+// Runs the sketch for frames draws, optionally resumed from a snapshot, and returns the last snapshot it saved
+function runSketch(snapshot, frames) {
+  let saved = null;
+  let sketch;
+  const p5 = function (fn) { sketch = fn; };
+  p5.Vector = Vector;
+  const noop = () => {};
+  const p = {
+    width: 700, height: 500, TWO_PI: 2 * Math.PI,
+    createVector: (x, y) => new Vector(x, y),
+    color: (...a) => ({ levels: a.length === 1 ? [a[0], a[0], a[0], 255] : [a[0], a[1], a[2], a[3] === undefined ? 255 : a[3]] }),
+    red: (c) => c.levels[0], green: (c) => c.levels[1], blue: (c) => c.levels[2],
+    constrain: (v, lo, hi) => Math.min(Math.max(v, lo), hi), sin: Math.sin, cos: Math.cos,
+    createCanvas: () => ({ parent: noop }), background: noop, stroke: noop, point: noop, noStroke: noop, fill: noop, ellipse: noop,
+  };
+  const document = { getElementById: () => ({ innerHTML: '' }) };
+  const window = { sessionStorage: { getItem: () => snapshot, setItem: (k, v) => { saved = v; } } };
+  new Function('p5', 'document', 'window', SKETCH)(p5, document, window);
+  sketch(p);
+  p.setup();
+  for (let i = 0; i < frames; i++) p.draw();
+  return saved;
+}
+"""
+
+
+def test_js_hash32_matches_pinned_vectors(js_hash32, hash32_vectors):
+    assert js_hash32([list(args) for args, _ in hash32_vectors]) == [expected for _, expected in hash32_vectors]
+
+
+def test_snapshot_resumes_identically(node, p5_sketch):
+    script = f"""const SKETCH = {json.dumps(p5_sketch(G=1.0, alpha=0.5, strong_force=1.0, lambda_const=0.5, seed=7))};
+{P5_STUB}
+const atHalf = runSketch(null, 600);
+const fresh = runSketch(null, 1200);
+const resumed = runSketch(atHalf, 600);
+const again = runSketch(null, 1200);
+console.log(JSON.stringify({{ atHalf, fresh, resumed, again }}));"""
+    runs = {name: json.loads(state) for name, state in json.loads(node(script)).items()}
+    assert runs["atHalf"]["frame"] == 600 and runs["fresh"]["frame"] == 1200
+    assert runs["resumed"] == runs["fresh"]
+    assert runs["again"] == runs["fresh"]
+    assert runs["fresh"]["particles"] != runs["atHalf"]["particles"]
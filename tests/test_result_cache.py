@@ -0,0 +1,83 @@
+import pickle
+import sqlite3
+import time
+
+import pytest
+
+from result_cache import ResultCache, model_version
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "results.sqlite"), "v1", max_bytes=10_000)
+
+
+def test_round_trip_and_version_isolation(cache):
+    cache.set("grid", (1.0, 2.0), [1, 2, 3])
+    assert cache.get("grid", (1.0, 2.0)) == [1, 2, 3]
+    assert cache.get("grid", (1.0, 3.0), "missing") == "missing"
+    assert ResultCache(cache.path, "v2").get("grid", (1.0, 2.0), "missing") == "missing"
+
+
+def test_evicts_least_recently_used_down_to_the_budget(cache):
+    for i in range(5):
+        cache.set("blob", (i,), bytes(3000))
+    db = sqlite3.connect(cache.path)
+    assert db.execute("SELECT SUM(size) FROM results").fetchone()[0] <= cache.max_bytes
+    assert cache.get("blob", (0,)) is None
+    assert cache.get("blob", (4,)) == bytes(3000)
+
+
+def test_unreadable_entry_is_dropped(cache):
+    cache.set("grid", (1,), "ok")
+    db = sqlite3.connect(cache.path)
+    # A pickle referencing a class that no longer exists raises AttributeError, not UnpicklingError
+    stale = pickle.dumps(pickle.loads).replace(b"loads", b"gone!")
+    db.execute("UPDATE results SET value = ?", (stale,))
+    db.commit()
+    assert cache.get("grid", (1,), "fallback") == "fallback"
+    assert db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+
+
+def test_hit_does_not_wait_for_a_busy_writer(cache):
+    cache.set("grid", (1,), "ok")
+    db = sqlite3.connect(cache.path, isolation_level=None)
+    db.execute("UPDATE results SET accessed = 0")
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.monotonic()
+        assert cache.get("grid", (1,)) == "ok"
+        assert time.monotonic() - start < 0.5
+    finally:
+        db.execute("ROLLBACK")
+
+
+def test_memoize_calls_through_once(cache):
+    calls = []
+
+    @cache.memoize("square")
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(3) == square(3) == 9
+    assert calls == [3]
+
+
+def test_model_version_tracks_sources_and_libraries(tmp_path):
+    source = tmp_path / "model.py"
+    source.write_text("a = 1")
+    before = model_version(str(source))
+    assert model_version(str(source), libraries=()) != before
+    source.write_text("a = 2")
+    assert model_version(str(source)) != before
+
+
+def test_unusable_path_disables_the_cache(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    cache = ResultCache(str(blocker / "results.sqlite"), "v1")
+    assert not cache.enabled
+    cache.set("grid", (1,), "ok")
+    assert cache.get("grid", (1,), "fallback") == "fallback"
+    assert cache.memoize("double")(lambda x: 2 * x)(4) == 8
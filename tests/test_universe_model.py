@@ -0,0 +1,10 @@
+import numpy as np
+
+from universe_model import health_scores, life_score_grid
+
+
+def test_life_score_grid_matches_pointwise_scores():
+    G_vals = np.linspace(0.1, 10, 7)
+    L_vals = np.linspace(0, 2, 5)
+    expected = [[health_scores(g, 0.5, 1.2, lam)[3] for lam in L_vals] for g in G_vals]
+    np.testing.assert_allclose(life_score_grid(0.5, 1.2, G_vals, L_vals), expected)
@@ -0,0 +1,120 @@
+import json
+import random
+import threading
+import time
+
+import pytest
+
+import universe_stream
+from universe_stream import MAX_UNIVERSES, SharedUniverse, StreamServer, Universe, encode_delta, hash32, parse_query
+
+
+def test_hash32_matches_pinned_vectors(hash32_vectors):
+    assert [hash32(*args) for args, _ in hash32_vectors] == [expected for _, expected in hash32_vectors]
+
+
+def test_hash32_matches_javascript(js_hash32):
+    rng = random.Random(0)
+    pairs = [[rng.randrange(2 ** 32), rng.randrange(10 ** 7)] for _ in range(200)]
+    assert js_hash32(pairs) == [hash32(seed, counter) for seed, counter in pairs]
+
+
+def run(seed, steps=300, constants=(1.0, 0.5, 1.0, 0.5)):
+    u = Universe(*constants, seed)
+    for _ in range(steps):
+        u.step()
+    return u.quantized(), u.state()
+
+
+def test_universe_is_deterministic_per_seed():
+    assert run(7) == run(7)
+    assert run(7)[0] != run(8)[0]
+
+
+def test_encode_delta_births_deaths_and_updates():
+    prev = {1: (0, 10, 10, 4, 0xFFFFFFFF), 2: (0, 20, 20, 4, 0xFFFFFFFF), 3: (1, 30, 30, 8, 0xFF0000FF)}
+    cur = {1: (0, 10, 10, 4, 0xFFFFFFFF), 2: (0, 21, 20, 4, 0xFFFFFFFF), 4: (2, 40, 40, 6, 0x000000FF)}
+    delta = json.loads(encode_delta(prev, cur, 5, [1.0, 0, "Big Bang Phase"]))
+    assert delta == {
+        "f": 5,
+        "b": [[4, 2, 40, 40, 6, 0x000000FF]],
+        "d": [3],
+        "u": [[2, 21, 20, 4, 0xFFFFFFFF]],
+        "h": [1.0, 0, "Big Bang Phase"],
+    }
+    assert json.loads(encode_delta(prev, cur, 9, [], skipped=3))["s"] == 3
+
+
+def test_slow_viewer_skips_to_the_newest_frame():
+    shared = SharedUniverse(1.0, 0.5, 1.0, 0.5, seed=1, fps=200)
+    stream = shared.subscribe()
+    try:
+        first = json.loads(next(stream))
+        # Everything alive so far arrives as births
+        assert first["d"] == [] and first["u"] == []
+        time.sleep(0.2)
+        caught_up = json.loads(next(stream))
+        assert caught_up["s"] == caught_up["f"] - first["f"] - 1 > 0
+    finally:
+        stream.close()
+    assert shared.viewers == 0
+
+
+def test_parse_query_accepts_slider_values():
+    assert parse_query("G=1.0&alpha=0.5&strong=1.0&lambda=0.0&seed=42") == ((1.0, 0.5, 1.0, 0.0), 42)
+
+
+def test_parse_query_snaps_to_the_slider_lattice():
+    assert parse_query("G=1.000001&alpha=0.504&strong=0.96&lambda=0.2&seed=1") == ((1.0, 0.5, 1.0, 0.2), 1)
+
+
+@pytest.mark.parametrize("query", [
+    "G=1.0&alpha=0.5&strong=1.0",
+    "G=nan&alpha=0.5&strong=1.0&lambda=0.5",
+    "G=inf&alpha=0.5&strong=1.0&lambda=0.5",
+    "G=1e9&alpha=0.5&strong=1.0&lambda=0.5",
+    "G=1.0&alpha=0.5&strong=1.0&lambda=-0.1",
+    "G=1.0&alpha=0.5&strong=1.0&lambda=0.5&seed=-1",
+    "G=1.0&alpha=0.5&strong=1.0&lambda=0.5&seed=4294967296",
+    "G=one&alpha=0.5&strong=1.0&lambda=0.5",
+])
+def test_parse_query_rejects_values_outside_the_sliders(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+
+@pytest.fixture
+def server():
+    server = StreamServer(("127.0.0.1", 0))
+    yield server
+    server.server_close()
+
+
+def test_universe_for_refuses_new_universes_when_all_are_watched(server):
+    constants = (1.0, 0.5, 1.0, 0.5)
+    for seed in range(MAX_UNIVERSES):
+        server.universe_for(constants, seed).viewers = 1
+    assert server.universe_for(constants, MAX_UNIVERSES) is None
+    assert server.universe_for(constants, 0) is server.universes[(*constants, 0)]
+
+    server.universes[(*constants, 0)].viewers = 0
+    assert server.universe_for(constants, MAX_UNIVERSES) is not None
+    assert len(server.universes) == MAX_UNIVERSES
+
+
+def test_universe_that_fails_to_step_is_replaced(server, monkeypatch):
+    constants = (1.0, 0.5, 1.0, 0.5)
+    broken = server.universe_for(constants, 1)
+    monkeypatch.setattr(broken.universe, "step", lambda: 1 / 0)
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+    stream = broken.subscribe()
+    # The first frame is sent before any step; the stream then ends when the stepping thread dies
+    next(stream)
+    assert list(stream) == []
+    assert server.universe_for(constants, 1) is not broken
+
+
+def test_thin_client_starfield_is_seeded():
+    assert universe_stream.starfield(7) == universe_stream.starfield(7)
+    assert universe_stream.starfield(7) != universe_stream.starfield(8)
+    assert "Math.random" not in universe_stream.renderer_html("http://localhost:8502", 1.0, 0.5, 1.0, 0.5, 7)
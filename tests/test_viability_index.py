@@ -0,0 +1,99 @@
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import viability_index
+import viability_rules
+from universe_model import health_scores
+from viability_index import Axis, ViabilityIndex, build
+
+# Coarse lattice whose Λ axis doesn't fill its last packed byte
+SMALL_AXES = (
+    Axis("G", 0.1, 0.4, 12),
+    Axis("alpha", 0.01, 0.15, 11),
+    Axis("strong_force", 0.1, 0.5, 10),
+    Axis("lambda_const", 0.0, 0.1, 21),
+)
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("index") / "viability_index_test.npy")
+    build(path, axes=SMALL_AXES)
+    return ViabilityIndex(path, axes=SMALL_AXES)
+
+
+@pytest.fixture(scope="module")
+def brute_force():
+    """(threshold, life) verdicts for every lattice point, computed one point at a time."""
+    planes = np.zeros((2, *(axis.count for axis in SMALL_AXES)), dtype=bool)
+    for idx in itertools.product(*(range(axis.count) for axis in SMALL_AXES)):
+        point = [float(axis.values(i, i)[0]) for axis, i in zip(SMALL_AXES, idx)]
+        planes[(0, *idx)] = viability_rules.threshold_score(*point) == 4
+        planes[(1, *idx)] = viability_rules.in_band("life_score", health_scores(*point)[3])
+    return {"threshold": planes[0], "life": planes[1], "viable": planes[0] & planes[1]}
+
+
+def test_is_viable_matches_brute_force(index, brute_force):
+    for idx in itertools.product(*(range(axis.count) for axis in SMALL_AXES)):
+        assert index.is_viable(*index.values(idx)) == brute_force["viable"][idx]
+
+
+@pytest.mark.parametrize("plane", ["threshold", "life", "viable"])
+def test_count_matches_brute_force(index, brute_force, plane):
+    assert index.count(plane=plane) == brute_force[plane].sum() > 0
+    box = [(2, 9), (1, 7), (0, 4), (3, 17)]
+    expected = brute_force[plane][tuple(slice(lo, hi + 1) for lo, hi in box)].sum()
+    assert index.count(box, plane=plane) == expected
+
+
+@pytest.mark.parametrize("plane", ["threshold", "viable"])
+def test_nearest_matches_brute_force(index, brute_force, plane):
+    hits = np.argwhere(brute_force[plane])
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        origin = [int(rng.integers(axis.count)) for axis in SMALL_AXES]
+        best = ((hits - origin) ** 2).sum(axis=1).min()
+        found = index.nearest(*index.values(origin), plane=plane)
+        assert found is not None
+        assert ((np.array(index.indices(*found)) - origin) ** 2).sum() == best
+        assert brute_force[plane][index.indices(*found)]
+
+
+class SmallIndex(ViabilityIndex):
+    def __init__(self, path):
+        super().__init__(path, axes=SMALL_AXES)
+
+
+def test_concurrent_cold_starts_build_once(tmp_path, monkeypatch):
+    builds = []
+
+    def slow_build(path):
+        builds.append(path)
+        time.sleep(0.2)
+        build(path, axes=SMALL_AXES)
+
+    monkeypatch.setattr(viability_index, "build", slow_build)
+    with ThreadPoolExecutor(4) as pool:
+        loaded = list(pool.map(lambda _: SmallIndex.load_or_build(str(tmp_path)), range(4)))
+    assert len(builds) == 1
+    assert all(index.count() == loaded[0].count() for index in loaded)
+
+
+def test_remove_stale_keeps_recently_loaded_indexes(tmp_path):
+    day = 24 * 3600
+    files = {name: tmp_path / name for name in
+             ("viability_index_new.npy", "viability_index_recent.npy", "viability_index_old.npy",
+              "viability_index_old.npy.123.tmp", "viability_index.lock", "results.sqlite")}
+    for name, file in files.items():
+        file.write_bytes(b"")
+        age = 2 * day if "old" in name or name == "results.sqlite" else 60
+        os.utime(file, (time.time() - age, time.time() - age))
+
+    viability_index.remove_stale(str(tmp_path), keep=str(files["viability_index_new.npy"]), max_age=day)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "results.sqlite", "viability_index.lock", "viability_index_new.npy", "viability_index_recent.npy"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import viability_rules
+from universe_model import health_scores
+from viability_rules import HIGH, LOW, OK
+
+# The literal thresholds Space_Sim.py used before the rules table existed
+OLD_BOUNDS = {
+    "G": (0.3, 3.0),
+    "alpha": (0.05, 1.5),
+    "strong_force": (0.3, 5.0),
+    "lambda_const": (0.01, 1.5),
+    "star_score": (0.1, 10),
+    "atom_score": (0.05, 5.0),
+    "cosmos_score": (0.2, 10),
+}
+
+
+def old_verdict(name, value):
+    low, high = OLD_BOUNDS[name]
+    if value < low:
+        return LOW
+    elif value > high:
+        return HIGH
+    return OK
+
+
+def old_life_ok(life_score):
+    return life_score > 0.5 and life_score < 5.0
+
+
+# Every slider value plus the band edges themselves, where the closed/open distinction matters
+SAMPLES = sorted({round(v, 2) for v in np.arange(0, 20.01, 0.01)} | {0.05, 0.1, 0.2, 0.3, 0.5, 1.5, 3.0, 5.0, 10})
+
+
+@pytest.mark.parametrize("name", OLD_BOUNDS)
+def test_bands_match_the_old_thresholds(name):
+    assert viability_rules.classify(name, SAMPLES).tolist() == [old_verdict(name, v) for v in SAMPLES]
+
+
+def test_life_band_is_open():
+    assert viability_rules.in_band("life_score", SAMPLES).tolist() == [old_life_ok(v) for v in SAMPLES]
+
+
+def test_threshold_score_matches_old_checks_on_the_slider_lattice():
+    rng = np.random.default_rng(0)
+    G, alpha, strong, lam = (np.round(rng.integers(lo, hi, 5000) * step, 2)
+                             for lo, hi, step in ((1, 101, 0.1), (1, 201, 0.01), (1, 101, 0.1), (0, 201, 0.01)))
+    expected = [sum(old_verdict(name, v) == OK for name, v in zip(("G", "alpha", "strong_force", "lambda_const"), point))
+                for point in zip(G, alpha, strong, lam)]
+    assert viability_rules.threshold_score(G, alpha, strong, lam).tolist() == expected
+
+    scores = health_scores(G, alpha, strong, lam)
+    for name, values in zip(("star_score", "atom_score", "cosmos_score"), scores):
+        assert viability_rules.classify(name, values).tolist() == [old_verdict(name, v) for v in values]
+
+
+def test_js_constants_carry_the_same_table():
+    js = viability_rules.js_constants()
+    for name, (low, high) in OLD_BOUNDS.items():
+        assert f'"{name}": {{"low": {low}, "high": {high}, "open": false}}' in js
+    assert '"life_score": {"low": 0.5, "high": 5.0, "open": true}' in js
@@ -0,0 +1,21 @@
+"""Simplified "health score" model behind the interdependent-effects sections.
+
+Every function works on plain floats as well as NumPy arrays, so a whole grid
+of universes is scored with array operations instead of Python loops.
+"""
+
+import numpy as np
+
+
+def health_scores(G, alpha, strong_force, lambda_const):
+    star_score = 1.0 / (G * strong_force)
+    atom_score = alpha / (strong_force + 0.1)
+    cosmos_score = G / (lambda_const + 0.1)
+    life_score = (star_score * atom_score * cosmos_score) ** (1 / 3)
+    return star_score, atom_score, cosmos_score, life_score
+
+
+def life_score_grid(alpha, strong_force, G_vals, L_vals):
+    """Life score for every (G, Λ) pair - rows follow G_vals, columns follow L_vals."""
+    g, lam = np.meshgrid(G_vals, L_vals, indexing="ij")
+    return health_scores(g, alpha, strong_force, lam)[3]
@@ -0,0 +1,593 @@
+"""Server-side stepping of the universe simulation for thin clients.
+
+The universe is stepped once per (constants, seed) on the server and every viewer
+receives compact, quantized frame deltas over Server-Sent Events. A slow viewer
+never slows the simulation down: it simply gets a bigger delta (skipping frames)
+the next time its connection drains.
+"""
+
+import argparse
+import errno
+import json
+import math
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import viability_rules
+from viability_index import AXES
+from viability_rules import HIGH, LOW, OK
+
+WIDTH, HEIGHT = 700, 500
+FPS = 30
+MAX_UNIVERSES = 64
+# Small send buffers make a lagging viewer block after a few frames instead of queueing seconds of stale ones
+SEND_BUFFER_BYTES = 16 * 1024
+
+# Positions are sent in quarter pixels and sizes in half pixels
+POSITION_SCALE = 4
+SIZE_SCALE = 2
+
+
+# Same counter-based generator as the in-browser p5 sketch
+def hash32(seed, counter):
+    h = ((seed * 0x27D4EB2D) + (counter * 0x9E3779B1)) & 0xFFFFFFFF
+    h = ((h ^ (h >> 16)) * 0x85EBCA6B) & 0xFFFFFFFF
+    h = ((h ^ (h >> 13)) * 0xC2B2AE35) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+
+class CounterRNG:
+    def __init__(self, seed):
+        self.seed = seed
+        self.counter = 0
+
+    def random(self, lo, hi=None):
+        if hi is None:
+            lo, hi = 0, lo
+        value = hash32(self.seed, self.counter) / 4294967296
+        self.counter += 1
+        return lo + value * (hi - lo)
+
+
+class Particle:
+    kind = "P"
+
+    def __init__(self, u, x=None, y=None):
+        self.id = u.next_id()
+        self.x = x or u.rng.random(0, WIDTH)
+        self.y = y or u.rng.random(0, HEIGHT)
+        self.vx = u.rng.random(-0.5, 0.5)
+        self.vy = u.rng.random(-0.5, 0.5)
+        self.ax = self.ay = 0.0
+        self.mass = u.rng.random(0.5, 1.5)
+        self.size = self.mass * 4
+        self.color = (255, 255, 255, 255)
+        self.lifespan = 1000
+        self.energy = u.rng.random(0, 10)
+
+    def apply_force(self, fx, fy):
+        self.ax += fx / self.mass
+        self.ay += fy / self.mass
+
+    def update(self, u):
+        self.vx += self.ax
+        self.vy += self.ay
+        speed = math.hypot(self.vx, self.vy)
+        if speed > 5:
+            self.vx *= 5 / speed
+            self.vy *= 5 / speed
+        self.x += self.vx
+        self.y += self.vy
+        self.ax = self.ay = 0.0
+
+        self.lifespan -= 1
+
+        # Strong and alpha forces affect stability
+        if u.verdicts["strong_force"] == LOW or u.verdicts["alpha"] == LOW:
+            self.color = (255, 0, 0, 255)
+            if u.rng.random(1) < 0.01:
+                self.disintegrate(u)
+        elif u.verdicts["strong_force"] == HIGH or u.verdicts["alpha"] == HIGH:
+            self.color = (255, 165, 0, 255)
+            if u.rng.random(1) < 0.005 and len(u.stars) < 15:
+                self.form_star(u)
+        else:
+            self.color = (0, 255, 255, 255)
+            if u.rng.random(1) < 0.002 and len(u.stars) < 20:
+                self.form_star(u)
+
+        # Boundary wrap
+        if self.x < 0:
+            self.x = WIDTH
+        if self.x > WIDTH:
+            self.x = 0
+        if self.y < 0:
+            self.y = HEIGHT
+        if self.y > HEIGHT:
+            self.y = 0
+
+    def form_star(self, u):
+        if u.verdicts["G"] == OK:
+            u.stars.append(Star(u, self.x, self.y))
+            self.lifespan = 0
+
+    def disintegrate(self, u):
+        self.lifespan = 0
+        for _ in range(5):
+            u.particles.append(DisintegrationParticle(u, self.x, self.y))
+
+
+class DisintegrationParticle(Particle):
+    kind = "D"
+
+    def __init__(self, u, x, y):
+        super().__init__(u, x, y)
+        self.lifespan = u.rng.random(20, 60)
+        angle = u.rng.random(0, 2 * math.pi)
+        speed = u.rng.random(1, 3)
+        self.vx, self.vy = math.cos(angle) * speed, math.sin(angle) * speed
+        self.size = u.rng.random(1, 3)
+        self.color = (255, 200, 100, 255)
+
+    def update(self, u):
+        self.x += self.vx
+        self.y += self.vy
+        self.lifespan -= 1
+        self.color = (255, 200, 100, max(0, min(255, int(self.lifespan * 4))))
+
+
+class Star:
+    kind = "S"
+
+    def __init__(self, u, x, y):
+        self.id = u.next_id()
+        self.x, self.y = x, y
+        self.mass = u.rng.random(3, 8)
+        self.size = self.mass * 2
+        self.lifespan = u.rng.random(500, 2000)
+        self.color = (255, 255, 100, 255)
+        self.pulse_rate = u.rng.random(0.02, 0.05)
+        self.pulse_amount = 0.0
+        u.star_count += 1
+
+    def update(self, u):
+        self.lifespan -= u.G * u.strong_force
+        self.pulse_amount = math.sin(u.age * self.pulse_rate) * 2
+        if self.lifespan <= 100:
+            self.color = (255, 50, 50, 255)
+
+    def explode(self, u):
+        for _ in range(20):
+            u.particles.append(DisintegrationParticle(u, self.x, self.y))
+        if u.G > 2.0 and u.rng.random(1) < 0.3:
+            u.stars.append(BlackHole(u, self.x, self.y))
+
+
+class BlackHole:
+    kind = "B"
+
+    def __init__(self, u, x, y):
+        self.id = u.next_id()
+        self.x, self.y = x, y
+        self.mass = 10
+        self.size = 10
+        self.lifespan = 5000
+        self.pulse_amount = 0.0
+        self.color = (0, 0, 0, 255)
+
+    def update(self, u):
+        self.lifespan -= 1
+
+
+class Universe:
+    """Python port of the p5 sketch's update loop, without any drawing."""
+
+    def __init__(self, G, alpha, strong_force, lambda_const, seed):
+        self.G, self.alpha, self.strong_force, self.lambda_const = G, alpha, strong_force, lambda_const
+        # The constants never change during a run, so they are classified once against the rules table
+        self.verdicts = viability_rules.verdicts(G=G, alpha=alpha, strong_force=strong_force, lambda_const=lambda_const)
+        self.rng = CounterRNG(seed)
+        self.particles = []
+        self.stars = []
+        self.age = 0.0
+        self.star_count = 0
+        self.galaxy_formed = False
+        self.frame = 0
+        self._ids = 0
+
+        for _ in range(80):
+            self.particles.append(Particle(self))
+
+        # Initial central concentration for the Big Bang
+        for _ in range(20):
+            angle = self.rng.random(0, 2 * math.pi)
+            radius = self.rng.random(0, 50)
+            self.particles.append(Particle(self, WIDTH / 2 + math.cos(angle) * radius,
+                                           HEIGHT / 2 + math.sin(angle) * radius))
+
+    def next_id(self):
+        self._ids += 1
+        return self._ids
+
+    def _attract(self, a, b, scale=1.0):
+        dx, dy = b.x - a.x, b.y - a.y
+        dist = math.hypot(dx, dy)
+        if dist == 0:
+            return
+        strength = scale * (self.G * a.mass * b.mass) / min(max(dist, 10), 1000) ** 2
+        a.apply_force(dx / dist * strength, dy / dist * strength)
+
+    def _expand(self, pt):
+        dx, dy = pt.x - WIDTH / 2, pt.y - HEIGHT / 2
+        dist = math.hypot(dx, dy)
+        if dist < 1:
+            return
+        strength = self.lambda_const * 0.02 * (1 + self.age / 1000)
+        pt.apply_force(dx / dist * strength, dy / dist * strength)
+
+    def step(self):
+        self.age += 0.2
+
+        if len(self.stars) > 5 and not self.galaxy_formed and self.verdicts["G"] == OK:
+            self.galaxy_formed = True
+
+        particles = self.particles
+        for i, pt in enumerate(particles):
+            self._expand(pt)
+            for star in self.stars:
+                self._attract(pt, star, 3.0 if isinstance(star, BlackHole) else 1.0)
+            # Simplified particle gravity - only every 10th particle
+            if i % 10 == 0:
+                for j in range(0, len(particles), 10):
+                    if i != j:
+                        self._attract(pt, particles[j])
+
+        for i in range(len(self.stars) - 1, -1, -1):
+            star = self.stars[i]
+            star.update(self)
+            if star.lifespan <= 0:
+                if not isinstance(star, BlackHole):
+                    star.explode(self)
+                self.stars.pop(i)
+
+        for i in range(len(particles) - 1, -1, -1):
+            pt = particles[i]
+            pt.update(self)
+            if pt.lifespan <= 0:
+                particles.pop(i)
+
+        if len(particles) < 50 and self.frame % 30 == 0:
+            particles.append(Particle(self))
+
+        self.frame += 1
+
+    def state(self):
+        if self.age < 100:
+            return "Big Bang Phase"
+        if self.verdicts["lambda_const"] == HIGH:
+            return "Rapid Expansion - Particles Too Dispersed"
+        if self.verdicts["G"] == LOW:
+            return "Gravity Too Weak - No Structure Formation"
+        if self.verdicts["G"] == HIGH:
+            return "Gravity Too Strong - Rapid Collapse"
+        if self.verdicts["strong_force"] == LOW or self.verdicts["alpha"] == LOW:
+            return "Unstable Matter - Chemistry Impossible"
+        if self.star_count > 10 and self.galaxy_formed:
+            return "Stable Universe - Life Permitting"
+        return "Universe Evolving..."
+
+    def quantized(self):
+        """Entity id -> (kind, x, y, size, rgba) in integer units."""
+        frame = {}
+        for entity in self.stars + self.particles:
+            r, g, b, a = entity.color
+            frame[entity.id] = (
+                entity.kind,
+                round(entity.x * POSITION_SCALE),
+                round(entity.y * POSITION_SCALE),
+                round((entity.size + getattr(entity, "pulse_amount", 0)) * SIZE_SCALE),
+                (r << 24) | (g << 16) | (b << 8) | a,
+            )
+        return frame
+
+
+def encode_delta(prev, cur, frame, hud, skipped=0):
+    """Births, deaths and changed entities between two quantized frames, as JSON bytes."""
+    delta = {
+        "f": frame,
+        "b": [[i, *v] for i, v in cur.items() if i not in prev],
+        "d": [i for i in prev if i not in cur],
+        "u": [[i, *v[1:]] for i, v in cur.items() if i in prev and prev[i] != v],
+        "h": hud,
+    }
+    if skipped:
+        delta["s"] = skipped
+    return json.dumps(delta, separators=(",", ":")).encode()
+
+
+class SharedUniverse:
+    """One stepping thread per universe, shared by every viewer watching it."""
+
+    def __init__(self, G, alpha, strong_force, lambda_const, seed, fps=FPS, on_error=None):
+        self.universe = Universe(G, alpha, strong_force, lambda_const, seed)
+        self.fps = fps
+        # Called with this SharedUniverse when a step raises, so its owner can stop handing it out
+        self.on_error = on_error
+        self.frame = 0
+        self.state = self.universe.quantized()
+        self.hud = [0.0, 0, self.universe.state()]
+        self.viewers = 0
+        # Delta from frame - 1 to frame, encoded once for every viewer that is keeping up
+        self._last_delta = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _run(self):
+        try:
+            self._step_forever()
+        except Exception:
+            # Restarting on the same state would just fail again, so the universe is discarded
+            if self.on_error is not None:
+                self.on_error(self)
+            raise
+        finally:
+            # Normally the loop clears _thread itself; this covers a step that raised, so the
+            # current viewers end their streams instead of waiting on a dead thread
+            with self._cond:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                self._cond.notify_all()
+
+    def _step_forever(self):
+        next_tick = time.monotonic()
+        while True:
+            with self._cond:
+                if self.viewers == 0:
+                    self._thread = None
+                    return
+            self.universe.step()
+            u = self.universe
+            state = u.quantized()
+            hud = [round(u.age, 1), len(u.stars), u.state()]
+            delta = encode_delta(self.state, state, u.frame, hud)
+            with self._cond:
+                self.frame, self.state, self.hud, self._last_delta = u.frame, state, hud, delta
+                self._cond.notify_all()
+
+            next_tick += 1 / self.fps
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            # Don't try to catch up after a stall - drop the missed ticks instead
+            next_tick = max(next_tick, time.monotonic())
+
+    def subscribe(self):
+        """Yield encoded deltas for one viewer, skipping straight to the newest frame when it falls behind."""
+        with self._cond:
+            self.viewers += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        try:
+            sent_frame, sent_state = None, {}
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self.frame != sent_frame or self._thread is None, timeout=5)
+                    if self._thread is None:
+                        # The stepping thread died - end the stream and let the client reconnect
+                        return
+                    frame, state, hud, last_delta = self.frame, self.state, self.hud, self._last_delta
+                if frame == sent_frame:
+                    continue
+                if sent_frame is not None and frame == sent_frame + 1 and last_delta is not None:
+                    yield last_delta
+                else:
+                    skipped = frame - sent_frame - 1 if sent_frame is not None else 0
+                    yield encode_delta(sent_state, state, frame, hud, skipped)
+                sent_frame, sent_state = frame, state
+        finally:
+            with self._cond:
+                self.viewers -= 1
+
+
+def parse_query(query):
+    """(constants, seed) from a /stream query string, or ValueError unless every value is one the sliders allow.
+
+    Constants are snapped to the slider lattice, so near-identical values share one universe.
+    """
+    params = parse_qs(query)
+    try:
+        constants = tuple(float(params[key][0]) for key in ("G", "alpha", "strong", "lambda"))
+        seed = int(params.get("seed", ["0"])[0])
+    except (KeyError, ValueError):
+        raise ValueError("Expected G, alpha, strong, lambda and seed")
+    for axis, value in zip(AXES, constants):
+        if not (math.isfinite(value) and axis.start - 1e-9 <= value <= axis.stop + 1e-9):
+            raise ValueError(f"{axis.name} must be between {axis.start} and {axis.stop}")
+    if not 0 <= seed < 2 ** 32:
+        raise ValueError("seed must be a 32-bit unsigned integer")
+    return tuple(float(axis.values(axis.index(v), axis.index(v))[0]) for axis, v in zip(AXES, constants)), seed
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    def setup(self):
+        self.request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+        super().setup()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/stream":
+            self.send_error(404)
+            return
+        try:
+            constants, seed = parse_query(url.query)
+        except ValueError as error:
+            self.send_error(400, str(error))
+            return
+        shared = self.server.universe_for(constants, seed)
+        if shared is None:
+            self.send_error(503, "Too many universes are being streamed, try again later")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        # Writes block while the viewer's socket is full, which is what makes the next delta skip frames
+        stream = shared.subscribe()
+        try:
+            for payload in stream:
+                self.wfile.write(b"data: " + payload + b"\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stream.close()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, _StreamHandler)
+        self.universes = {}
+        self._lock = threading.Lock()
+
+    def universe_for(self, constants, seed):
+        """The shared universe for (constants, seed), or None if MAX_UNIVERSES are already being watched."""
+        key = (*constants, seed)
+        with self._lock:
+            if key not in self.universes:
+                if len(self.universes) >= MAX_UNIVERSES:
+                    for idle in [k for k, shared in self.universes.items() if shared.viewers == 0]:
+                        del self.universes[idle]
+                    if len(self.universes) >= MAX_UNIVERSES:
+                        return None
+                self.universes[key] = SharedUniverse(*constants, seed, on_error=lambda shared: self._discard(key, shared))
+            return self.universes[key]
+
+    def _discard(self, key, shared):
+        with self._lock:
+            if self.universes.get(key) is shared:
+                del self.universes[key]
+
+
+def start_server(host="0.0.0.0", port=8502):
+    """Serve streams from a background thread.
+
+    Returns None if the port is already taken - normally by a sibling Streamlit process
+    on the same host, whose server then streams for every process.
+    """
+    try:
+        server = StreamServer((host, port))
+    except OSError as error:
+        if error.errno != errno.EADDRINUSE:
+            raise
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def starfield(seed, count=100):
+    """(x, y, alpha) for each background star - the first frame of the p5 sketch's seeded sky."""
+    def channel(i, c):
+        return hash32(seed ^ 0x5BD1E995, i * 3 + c) / 4294967296
+    return [(round(channel(i, 1) * WIDTH, 1), round(channel(i, 2) * HEIGHT, 1), round((100 + channel(i, 0) * 155) / 255, 3))
+            for i in range(count)]
+
+
+def renderer_html(stream_url, G, alpha, strong_force, lambda_const, seed):
+    query = urlencode({"G": G, "alpha": alpha, "strong": strong_force, "lambda": lambda_const, "seed": seed})
+    return f"""
+<div style="position: relative; width: {WIDTH}px; height: {HEIGHT}px;">
+  <canvas id="thin-canvas" width="{WIDTH}" height="{HEIGHT}"></canvas>
+  <div id="thin-hud" style="position: absolute; top: 10px; left: 10px; background: rgba(0,0,0,0.7); padding: 10px; border-radius: 5px; color: white; font-family: monospace;">Connecting...</div>
+</div>
+<script>
+  const canvas = document.getElementById('thin-canvas');
+  const ctx = canvas.getContext('2d');
+  const hud = document.getElementById('thin-hud');
+  const entities = new Map();
+  let info = null;
+  let skipped = 0;
+  let dirty = false;
+
+  // Static starfield from the seed, drawn once instead of every frame
+  const sky = document.createElement('canvas');
+  sky.width = {WIDTH};
+  sky.height = {HEIGHT};
+  const skyCtx = sky.getContext('2d');
+  skyCtx.fillStyle = 'rgb(10, 10, 30)';
+  skyCtx.fillRect(0, 0, {WIDTH}, {HEIGHT});
+  for (const [x, y, alpha] of {json.dumps(starfield(seed))}) {{
+    skyCtx.fillStyle = `rgba(255, 255, 255, ${{alpha}})`;
+    skyCtx.fillRect(x, y, 1, 1);
+  }}
+
+  function rgba(c, alpha) {{
+    return `rgba(${{c >>> 24}}, ${{(c >>> 16) & 255}}, ${{(c >>> 8) & 255}}, ${{alpha === undefined ? (c & 255) / 255 : alpha}})`;
+  }}
+
+  const source = new EventSource('{stream_url}/stream?{query}');
+  // Every (re)connection starts with the full state as births, so anything left over is stale
+  source.onopen = () => {{
+    entities.clear();
+  }};
+  source.onmessage = (event) => {{
+    const delta = JSON.parse(event.data);
+    for (const [id, kind, x, y, size, color] of delta.b) entities.set(id, {{ kind, x, y, size, color }});
+    for (const id of delta.d) entities.delete(id);
+    for (const [id, x, y, size, color] of delta.u) Object.assign(entities.get(id), {{ x, y, size, color }});
+    info = delta.h;
+    skipped += delta.s || 0;
+    dirty = true;
+  }};
+  source.onerror = () => {{
+    hud.innerHTML = 'Reconnecting to simulation server...';
+  }};
+
+  // Deltas that arrive between two paints are applied but only drawn once
+  function paint() {{
+    if (dirty) {{
+      dirty = false;
+      ctx.drawImage(sky, 0, 0);
+      for (const e of entities.values()) {{
+        const x = e.x / {POSITION_SCALE}, y = e.y / {POSITION_SCALE}, r = e.size / {SIZE_SCALE} / 2;
+        if (e.kind === 'S' || e.kind === 'B') {{
+          ctx.fillStyle = e.kind === 'B' ? 'rgba(100, 0, 255, 0.4)' : rgba(e.color, 0.3);
+          ctx.beginPath();
+          ctx.arc(x, y, e.kind === 'B' ? r * 4 : r + 5, 0, 2 * Math.PI);
+          ctx.fill();
+        }}
+        ctx.fillStyle = rgba(e.color);
+        ctx.beginPath();
+        ctx.arc(x, y, r, 0, 2 * Math.PI);
+        ctx.fill();
+      }}
+      if (info) {{
+        hud.innerHTML = `<strong>Universe Age:</strong> ${{Math.floor(info[0])}}<br>`
+          + `<strong>Stars:</strong> ${{info[1]}}<br>`
+          + `<strong>State:</strong> ${{info[2]}}<br>`
+          + `<strong>Skipped frames:</strong> ${{skipped}}`;
+      }}
+    }}
+    requestAnimationFrame(paint);
+  }}
+  requestAnimationFrame(paint);
+</script>
+"""
+
+
+if __name__ == "__main__":
+    # Run the stream server as its own service, e.g. behind the same reverse proxy as the app
+    parser = argparse.ArgumentParser(description="Stream server-stepped universes to thin clients.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+    StreamServer((args.host, args.port)).serve_forever()
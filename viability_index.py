@@ -0,0 +1,189 @@
+"""Precomputed viability verdicts for every configuration the sliders can reach.
+
+The four sliders span a 100 x 200 x 100 x 201 lattice (about 4e8 universes).
+Two verdict planes - the 4/4 threshold score and the life_score band - are
+bit-packed along the Λ axis into one .npy file (~100 MB) that is built once,
+then memory-mapped by every worker. Lookups are O(1) bit reads; counts and
+nearest-neighbour searches unpack only the sub-box they need.
+"""
+
+import contextlib
+import glob
+import math
+import os
+import time
+
+import numpy as np
+
+import universe_model
+import viability_rules
+from result_cache import model_version
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process build lock, each worker may build its own copy
+    fcntl = None
+
+# Indexes for other model versions are only removed once no worker has loaded them for this long,
+# so a rolling deploy sharing the cache directory doesn't delete the index the other side is using
+STALE_INDEX_AGE = 24 * 3600
+
+
+class Axis:
+    def __init__(self, name, start, step, count):
+        self.name, self.start, self.step, self.count = name, start, step, count
+
+    def values(self, lo=0, hi=None):
+        hi = self.count - 1 if hi is None else hi
+        # Rounded like the slider values themselves, so 0.3 isn't 0.30000000000000004
+        return np.round(self.start + np.arange(lo, hi + 1) * self.step, 2)
+
+    @property
+    def stop(self):
+        return float(self.values(self.count - 1)[0])
+
+    def index(self, value):
+        return min(max(round((value - self.start) / self.step), 0), self.count - 1)
+
+
+# The constant sliders in Space_Sim.py are built from these, so the index always covers exactly what they can reach
+AXES = (
+    Axis("G", 0.1, 0.1, 100),
+    Axis("alpha", 0.01, 0.01, 200),
+    Axis("strong_force", 0.1, 0.1, 100),
+    Axis("lambda_const", 0.0, 0.01, 201),
+)
+
+PLANES = {"threshold": (0,), "life": (1,), "viable": (0, 1)}
+
+
+def _evaluate_slice(g, alpha, strong_force, lambda_const):
+    """Both verdict planes for one G value over the whole α x strong x Λ block."""
+    a = alpha[:, None, None]
+    s = strong_force[None, :, None]
+    lam = lambda_const[None, None, :]
+    threshold = viability_rules.threshold_score(g, a, s, lam) == 4
+    life = viability_rules.in_band("life_score", universe_model.health_scores(g, a, s, lam)[3])
+    return np.stack(np.broadcast_arrays(threshold, life))
+
+
+class ViabilityIndex:
+    def __init__(self, path, axes=AXES):
+        self.axes = axes
+        # (plane, G, α, strong, Λ bytes), Λ packed 8 configurations per byte
+        self.bits = np.load(path, mmap_mode="r")
+        # Whether each G slice has any viable configuration at all, so searches can skip empty ones
+        self.occupied = {plane: np.array([self._packed(g, slice(None), slice(None), slice(None), plane).any()
+                                          for g in range(axes[0].count)])
+                         for plane in PLANES}
+
+    @classmethod
+    def load_or_build(cls, cache_dir):
+        version = model_version(universe_model.__file__, viability_rules.__file__, __file__)
+        path = os.path.join(cache_dir, f"viability_index_{version}.npy")
+        if not os.path.exists(path):
+            with _build_lock(cache_dir):
+                # Another worker may have finished the build while this one waited for the lock
+                if not os.path.exists(path):
+                    build(path)
+                    remove_stale(cache_dir, keep=path)
+        # Marks the index as in use, see remove_stale
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return cls(path)
+
+    def indices(self, G, alpha, strong_force, lambda_const):
+        return tuple(axis.index(v) for axis, v in zip(self.axes, (G, alpha, strong_force, lambda_const)))
+
+    def values(self, indices):
+        return tuple(float(axis.values(i, i)[0]) for axis, i in zip(self.axes, indices))
+
+    def is_viable(self, G, alpha, strong_force, lambda_const, plane="viable"):
+        g, a, s, lam = self.indices(G, alpha, strong_force, lambda_const)
+        return all((self.bits[p, g, a, s, lam >> 3] >> (7 - (lam & 7))) & 1 for p in PLANES[plane])
+
+    def _packed(self, g, a, s, lam_bytes, plane):
+        # Planes are combined while still packed, eight configurations per AND
+        packed = None
+        for p in PLANES[plane]:
+            bits = self.bits[p, g, a, s, lam_bytes]
+            packed = bits if packed is None else packed & bits
+        return packed
+
+    def _block(self, g, a_range, s_range, lam_range, plane):
+        """Unpacked verdicts for one G slice restricted to inclusive index ranges."""
+        (a0, a1), (s0, s1), (l0, l1) = a_range, s_range, lam_range
+        packed = self._packed(g, slice(a0, a1 + 1), slice(s0, s1 + 1), slice(l0 >> 3, (l1 >> 3) + 1), plane)
+        return np.unpackbits(packed, axis=-1)[..., l0 & 7:(l0 & 7) + l1 - l0 + 1].astype(bool)
+
+    def count(self, box=None, plane="viable"):
+        """Viable configurations in box, a sequence of inclusive (lo, hi) index ranges per axis (default: everything)."""
+        box = box or [(0, axis.count - 1) for axis in self.axes]
+        (g0, g1), *rest = box
+        return sum(int(self._block(g, *rest, plane).sum()) for g in range(g0, g1 + 1))
+
+    def nearest(self, G, alpha, strong_force, lambda_const, plane="viable"):
+        """Closest viable configuration, by Euclidean distance in slider steps, or None if there is none."""
+        g0, *origin = self.indices(G, alpha, strong_force, lambda_const)
+        best, best_dist = None, math.inf
+
+        # Visit G slices outward from the current one, each time searching only the window
+        # that could still beat the best match so far
+        for dg in sorted(range(-g0, self.axes[0].count - g0), key=abs):
+            if dg * dg >= best_dist:
+                break
+            if not self.occupied[plane][g0 + dg]:
+                continue
+            if best is None:
+                window = [(0, axis.count - 1) for axis in self.axes[1:]]
+            else:
+                reach = math.isqrt(best_dist - dg * dg)
+                window = [(max(o - reach, 0), min(o + reach, axis.count - 1)) for o, axis in zip(origin, self.axes[1:])]
+
+            hits = np.argwhere(self._block(g0 + dg, *window, plane)) + [lo for lo, _ in window]
+            if len(hits) == 0:
+                continue
+            dists = ((hits - origin) ** 2).sum(axis=1) + dg * dg
+            i = int(dists.argmin())
+            if dists[i] < best_dist:
+                best, best_dist = (g0 + dg, *(int(v) for v in hits[i])), int(dists[i])
+
+        return None if best is None else self.values(best)
+
+
+@contextlib.contextmanager
+def _build_lock(cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, "viability_index.lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def remove_stale(cache_dir, keep, max_age=STALE_INDEX_AGE):
+    """Delete indexes (and abandoned partial builds) for other model versions not loaded for max_age seconds."""
+    cutoff = time.time() - max_age
+    for old in glob.glob(os.path.join(cache_dir, "viability_index_*.npy*")):
+        try:
+            if old != keep and os.path.getmtime(old) < cutoff:
+                os.remove(old)
+        except OSError:
+            pass
+
+
+def build(path, axes=AXES):
+    g_axis, a_axis, s_axis, l_axis = axes
+    alpha, strong_force, lambda_const = a_axis.values(), s_axis.values(), l_axis.values()
+    shape = (2, g_axis.count, a_axis.count, s_axis.count, (l_axis.count + 7) // 8)
+
+    # Written under a temporary name and renamed, so a sibling worker never maps a half-built index
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    bits = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8, shape=shape)
+    for i, g in enumerate(g_axis.values()):
+        bits[:, i] = np.packbits(_evaluate_slice(g, alpha, strong_force, lambda_const), axis=-1)
+    bits.flush()
+    del bits
+    os.replace(tmp_path, path)
@@ -0,0 +1,93 @@
+"""The single source of truth for every viability threshold in the app.
+
+Each rule is a band: values below it or above it make the universe non-viable.
+The bands are compiled into NumPy mask functions, so a point and a batch of
+millions of points are classified the same way, and the same table is emitted
+as JavaScript for the p5 simulation.
+"""
+
+import json
+from typing import NamedTuple
+
+import numpy as np
+
+LOW, OK, HIGH = -1, 0, 1
+
+
+class Band(NamedTuple):
+    low: float
+    high: float
+    # An open band excludes its bounds, e.g. life_score must be strictly between 0.5 and 5.0
+    open: bool = False
+
+    def compile(self):
+        """(below, above) functions returning boolean masks for this band."""
+        if self.open:
+            return (lambda x: np.asarray(x) <= self.low), (lambda x: np.asarray(x) >= self.high)
+        return (lambda x: np.asarray(x) < self.low), (lambda x: np.asarray(x) > self.high)
+
+
+# Section 1: the constants themselves
+CONSTANT_RULES = {
+    "G": Band(0.3, 3.0),
+    "alpha": Band(0.05, 1.5),
+    "strong_force": Band(0.3, 5.0),
+    "lambda_const": Band(0.01, 1.5),
+}
+
+# Sections 2 and 3: the combined health scores from universe_model
+SCORE_RULES = {
+    "star_score": Band(0.1, 10),
+    "atom_score": Band(0.05, 5.0),
+    "cosmos_score": Band(0.2, 10),
+    "life_score": Band(0.5, 5.0, open=True),
+}
+
+RULES = {**CONSTANT_RULES, **SCORE_RULES}
+CLASSIFIERS = {name: band.compile() for name, band in RULES.items()}
+
+
+def classify(name, values):
+    """LOW, OK or HIGH for every value, as an int8 array."""
+    below, above = CLASSIFIERS[name]
+    return np.where(below(values), LOW, np.where(above(values), HIGH, OK)).astype(np.int8)
+
+
+def verdict(name, value):
+    return int(classify(name, value))
+
+
+def verdicts(**values):
+    """verdict() for several named values at once, e.g. verdicts(G=1.0, alpha=0.5)."""
+    return {name: verdict(name, value) for name, value in values.items()}
+
+
+def in_band(name, values):
+    below, above = CLASSIFIERS[name]
+    return ~(below(values) | above(values))
+
+
+def threshold_score(G, alpha, strong_force, lambda_const):
+    """How many of the four constants are inside their band (the x/4 viability score)."""
+    return (in_band("G", G).astype(np.int8) + in_band("alpha", alpha)
+            + in_band("strong_force", strong_force) + in_band("lambda_const", lambda_const))
+
+
+def js_constants():
+    """The rules table plus band helpers, as JavaScript for the p5 simulation."""
+    table = {name: {"low": band.low, "high": band.high, "open": band.open} for name, band in RULES.items()}
+    return f"""const RULES = {json.dumps(table)};
+
+    function below(name, x) {{
+      const band = RULES[name];
+      return band.open ? x <= band.low : x < band.low;
+    }}
+
+    function above(name, x) {{
+      const band = RULES[name];
+      return band.open ? x >= band.high : x > band.high;
+    }}
+
+    function inBand(name, x) {{
+      return !below(name, x) && !above(name, x);
+    }}"""